@@ -0,0 +1,182 @@
+import os
+import re
+import json
+import hashlib
+import time
+import zlib
+import sqlite3
+import unicodedata
+from collections import namedtuple
+from requests.exceptions import RequestException
+
+# Shared on-disk cache for Genius search_song() lookups used by the ingestion scripts.
+#
+# Modes (set with GENIUS_CACHE_MODE in your .env or environment):
+#   record  - serve fresh entries from the cache, query Genius on a miss and store the result (default)
+#   replay  - serve everything from the cache, never touch the network (no API token needed)
+#   refresh - always query Genius and overwrite whatever is cached
+
+# Lives next to this module so every script shares one cache regardless of the working directory
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'genius_cache.sqlite3')
+FOUND_TTL = 90 * 24 * 60 * 60  # Lyrics rarely change, keep hits for 90 days
+NOT_FOUND_TTL = 7 * 24 * 60 * 60  # Re-check misses after a week
+CACHE_MODES = ('record', 'replay', 'refresh')
+# Genius client options that change what search_song() returns, so they are part of the cache key
+RESULT_OPTIONS = ('remove_section_headers', 'skip_non_songs', 'excluded_terms')
+
+CachedSong = namedtuple('CachedSong', ['title', 'artist', 'lyrics'])
+
+
+def normalize_query_part(value):
+    """
+    Normalizes one part of a search query so trivially different spellings share a cache entry.
+    """
+    value = unicodedata.normalize('NFKC', value or '')
+    # Treat curly and straight apostrophes the same (e.g. "Pa’ Mí" vs "Pa' Mí")
+    value = value.replace('’', "'").replace('‘', "'")
+    value = re.sub(r'\s+', ' ', value)
+    return value.strip().casefold()
+
+
+def options_fingerprint(options):
+    """
+    Returns a short hash of the result-affecting Genius client options.
+    """
+    relevant = {name: options[name] for name in RESULT_OPTIONS if name in (options or {})}
+    encoded = json.dumps(relevant, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha1(encoded).hexdigest()[:12]
+
+
+def make_cache_key(title, artist='', options=None):
+    """
+    Builds the cache key for a search_song() call from its normalized title and artist,
+    plus a fingerprint of the client options so differently configured scripts don't share entries.
+    """
+    parts = [normalize_query_part(part) for part in (title, artist)]
+    parts.append(options_fingerprint(options))
+    return '\x1f'.join(parts)
+
+
+class CachedGenius:
+    """
+    Wraps a lyricsgenius.Genius client with a SQLite-backed record/replay cache.
+    Found and not-found results are both stored, each with its own TTL.
+    """
+
+    def __init__(self, genius=None, cache_path=DEFAULT_CACHE_PATH, mode='record', options=None,
+                 found_ttl=FOUND_TTL, not_found_ttl=NOT_FOUND_TTL):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown Genius cache mode '{mode}'. Use one of: {', '.join(CACHE_MODES)}.")
+        if genius is None and mode != 'replay':
+            raise ValueError("A Genius client is required unless the cache is in replay mode.")
+
+        self.genius = genius
+        self.mode = mode
+        self.options = dict(options or {})
+        self.found_ttl = found_ttl
+        self.not_found_ttl = not_found_ttl
+        self.used_network = False
+        # Keep the retry settings available to the scripts even when running offline
+        self.retries = genius.retries if genius else 1
+        self.sleep_time = genius.sleep_time if genius else 0
+
+        self.db = sqlite3.connect(cache_path)
+        self.db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS search_song (
+                query_key TEXT PRIMARY KEY,
+                found INTEGER NOT NULL,
+                title TEXT,
+                artist TEXT,
+                lyrics BLOB,
+                fetched_at REAL NOT NULL
+            ) WITHOUT ROWID
+            """
+        )
+        self.db.commit()
+
+    @classmethod
+    def from_env(cls, **genius_kwargs):
+        """
+        Creates a cached client configured from GENIUS_API_TOKEN, GENIUS_CACHE_MODE and GENIUS_CACHE_PATH.
+        The Genius client is only built (and the token only required) when the mode may hit the network.
+        """
+        mode = os.getenv('GENIUS_CACHE_MODE', 'record').strip().lower()
+        cache_path = os.getenv('GENIUS_CACHE_PATH', DEFAULT_CACHE_PATH)
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown Genius cache mode '{mode}'. Use one of: {', '.join(CACHE_MODES)}.")
+
+        genius = None
+        if mode != 'replay':
+            token = os.getenv('GENIUS_API_TOKEN')
+            if not token:
+                raise ValueError("Please set the GENIUS_API_TOKEN in your .env file.")
+            import lyricsgenius
+            genius = lyricsgenius.Genius(token, **genius_kwargs)
+
+        return cls(genius, cache_path=cache_path, mode=mode, options=genius_kwargs)
+
+    @property
+    def offline(self):
+        return self.mode == 'replay'
+
+    def search_song(self, title, artist=''):
+        """
+        Same as Genius.search_song(), but answered from the cache whenever possible.
+        Returns a CachedSong, or None if the song was not found.
+        If refreshing an expired entry fails with a network error, the expired lyrics are returned instead.
+        """
+        key = make_cache_key(title, artist, self.options)
+        stale_song = None
+
+        if self.mode != 'refresh':
+            row = self.db.execute(
+                "SELECT found, title, artist, lyrics, fetched_at FROM search_song WHERE query_key = ?",
+                (key,)
+            ).fetchone()
+            if row is not None:
+                found, song_title, song_artist, lyrics, fetched_at = row
+                ttl = self.found_ttl if found else self.not_found_ttl
+                cached_song = None
+                if found:
+                    cached_song = CachedSong(song_title, song_artist, zlib.decompress(lyrics).decode('utf-8'))
+                # Replay serves stale entries too, so offline runs are deterministic
+                if self.offline or time.time() - fetched_at < ttl:
+                    return cached_song
+                stale_song = cached_song
+
+        if self.offline:
+            print(f"No cached Genius result for '{title}' by {artist} (replay mode).")
+            return None
+
+        # Network errors are never cached; they propagate unless there are expired lyrics to fall back on
+        self.used_network = True
+        try:
+            fetched_song = self.genius.search_song(title, artist)
+        except RequestException as e:
+            if stale_song is None:
+                raise
+            print(f"Genius lookup for '{title}' failed ({e}), using expired cached lyrics.")
+            return stale_song
+        if fetched_song and fetched_song.lyrics:
+            song = CachedSong(fetched_song.title, fetched_song.artist, fetched_song.lyrics)
+            self.db.execute(
+                "INSERT OR REPLACE INTO search_song VALUES (?, 1, ?, ?, ?, ?)",
+                (key, song.title, song.artist, zlib.compress(song.lyrics.encode('utf-8')), time.time())
+            )
+        else:
+            song = None
+            self.db.execute(
+                "INSERT OR REPLACE INTO search_song VALUES (?, 0, NULL, NULL, NULL, ?)",
+                (key, time.time())
+            )
+        self.db.commit()
+        return song
+
+    def throttle(self, seconds):
+        """
+        Sleeps between songs to respect rate limits, but only if Genius was actually queried since the last call.
+        """
+        if self.used_network:
+            time.sleep(seconds)
+        self.used_network = False
@@ -1,21 +1,16 @@
-import os
 import json
 import time
 import re
-import lyricsgenius
 from dotenv import load_dotenv
 from requests.exceptions import ReadTimeout, ConnectionError
+from genius_cache import CachedGenius
 
 # Load environment variables from .env
 load_dotenv()
-GENIUS_API_TOKEN = os.getenv("GENIUS_API_TOKEN")
-
-if not GENIUS_API_TOKEN:
-    raise ValueError("Please set the GENIUS_API_TOKEN in your .env file.")
 
 # Initialize the Genius client with increased timeout and retries
-genius = lyricsgenius.Genius(
-    GENIUS_API_TOKEN,
+# Lookups go through the on-disk cache; set GENIUS_CACHE_MODE=replay to run fully offline
+genius = CachedGenius.from_env(
     timeout=15,  # Increase timeout to 15 seconds
     retries=3,    # Number of retries on failure
     sleep_time=5, # Time to wait between retries in seconds
@@ -153,7 +148,7 @@ def fetch_translated_song(song):
     # If not found via title variants, attempt a general search with specific query
     try:
         query = f"{song['song']} English translation {song['artist']}"
-        fetched_song = genius.search_song(song['song'], song['artist'], sort="title")
+        fetched_song = genius.search_song(song['song'], song['artist'])
         if fetched_song and fetched_song.lyrics:
             # Heuristically extract the English translation if present
             # This might not be accurate and may require manual verification
@@ -222,7 +217,7 @@ def fetch_and_store_lyrics(songs, output_file_original='original_songs.json', ou
             print(f"English translated lyrics not found for '{song['song']}'. Skipping to next song.\n")
 
         # Optional: Delay between requests to respect rate limits
-        time.sleep(2)  # Sleep for 2 seconds
+        genius.throttle(2)  # Sleep for 2 seconds, skipped when everything came from the cache
 
     # Save fetched original lyrics to JSON file
     with open(output_file_original, 'w', encoding='utf-8') as f:
@@ -1,22 +1,17 @@
 
-import os
 import json
 import time
 import re
-import lyricsgenius
 from dotenv import load_dotenv
 from requests.exceptions import ReadTimeout, ConnectionError
+from genius_cache import CachedGenius
 
 # Load environment variables from .env
 load_dotenv()
-GENIUS_API_TOKEN = os.getenv("GENIUS_API_TOKEN")
-
-if not GENIUS_API_TOKEN:
-    raise ValueError("Please set the GENIUS_API_TOKEN in your .env file.")
 
 # Initialize the Genius client with increased timeout
-genius = lyricsgenius.Genius(
-    GENIUS_API_TOKEN,
+# Lookups go through the on-disk cache; set GENIUS_CACHE_MODE=replay to run fully offline
+genius = CachedGenius.from_env(
     timeout=15,  # Increase timeout to 15 seconds
     retries=3,  # Number of retries on failure
     sleep_time=5,  # Time to wait between retries in seconds
@@ -160,7 +155,7 @@ def fetch_and_store_lyrics(songs, output_file='song2.json'):
                 break  # Do not retry on unexpected errors
 
         # Optional: Delay between requests to respect rate limits
-        time.sleep(2)  # Sleep for 2 seconds
+        genius.throttle(2)  # Sleep for 2 seconds, skipped when everything came from the cache
 
     # Save fetched lyrics to JSON file
     with open(output_file, 'w', encoding='utf-8') as f:
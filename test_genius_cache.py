@@ -0,0 +1,132 @@
+# Run with: pip install -r requirements-dev.txt && python -m pytest -q
+
+import time
+from types import SimpleNamespace
+
+import pytest
+from requests.exceptions import ReadTimeout, Timeout, HTTPError
+
+from genius_cache import CachedGenius, CachedSong
+
+
+class StubGenius:
+    """
+    Stands in for lyricsgenius.Genius, answering from a dict and recording every call.
+    """
+    retries = 3
+    sleep_time = 5
+
+    def __init__(self, songs=None, error=None):
+        self.songs = songs or {}
+        self.error = error
+        self.calls = []
+
+    def search_song(self, title=None, artist='', song_id=None, get_full_info=True):
+        self.calls.append((title, artist))
+        if self.error:
+            raise self.error
+        lyrics = self.songs.get(title)
+        if lyrics is None:
+            return None
+        return SimpleNamespace(title=title, artist=artist, lyrics=lyrics)
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / 'genius_cache.sqlite3')
+
+
+def test_equivalent_spellings_share_one_entry(cache_path):
+    stub = StubGenius({'Te Quiero Pa’ Mí': 'la la la'})
+    cached = CachedGenius(stub, cache_path=cache_path)
+
+    first = cached.search_song('Te Quiero Pa’ Mí', 'Don Omar')
+    second = cached.search_song("te quiero pa'  mí", ' don omar ')
+
+    assert first == second == CachedSong('Te Quiero Pa’ Mí', 'Don Omar', 'la la la')
+    assert len(stub.calls) == 1
+
+
+def test_misses_are_cached_until_not_found_ttl(cache_path, monkeypatch):
+    stub = StubGenius()
+    cached = CachedGenius(stub, cache_path=cache_path, not_found_ttl=60)
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now)
+
+    assert cached.search_song('Missing', 'Nobody') is None
+    assert cached.search_song('Missing', 'Nobody') is None
+    assert len(stub.calls) == 1
+
+    monkeypatch.setattr(time, 'time', lambda: now + 61)
+    assert cached.search_song('Missing', 'Nobody') is None
+    assert len(stub.calls) == 2
+
+
+def test_client_errors_are_not_cached(cache_path):
+    stub = StubGenius({'Ya Rayah': 'ya rayah'}, error=ReadTimeout('timed out'))
+    cached = CachedGenius(stub, cache_path=cache_path)
+
+    with pytest.raises(ReadTimeout):
+        cached.search_song('Ya Rayah', 'Rachid Taha')
+
+    stub.error = None
+    assert cached.search_song('Ya Rayah', 'Rachid Taha').lyrics == 'ya rayah'
+    assert len(stub.calls) == 2
+
+
+@pytest.mark.parametrize('error', [Timeout('timed out'), HTTPError('503 Server Error')])
+def test_expired_lyrics_are_used_when_refresh_fails(cache_path, monkeypatch, error):
+    stub = StubGenius({'Je Veux': 'je veux'})
+    cached = CachedGenius(stub, cache_path=cache_path, found_ttl=60)
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now)
+    cached.search_song('Je Veux', 'Zaz')
+
+    stub.error = error
+    monkeypatch.setattr(time, 'time', lambda: now + 61)
+    assert cached.search_song('Je Veux', 'Zaz').lyrics == 'je veux'
+    assert len(stub.calls) == 2
+
+
+def test_replay_never_calls_the_client(cache_path):
+    stub = StubGenius({'Papaoutai': 'papaoutai'})
+    CachedGenius(stub, cache_path=cache_path).search_song('Papaoutai', 'Stromae')
+    CachedGenius(stub, cache_path=cache_path).search_song('Ouda', 'Hamid Al Shaeri')
+
+    replay = CachedGenius(None, cache_path=cache_path, mode='replay', found_ttl=0, not_found_ttl=0)
+
+    assert replay.search_song('Papaoutai', 'Stromae').lyrics == 'papaoutai'
+    assert replay.search_song('Ouda', 'Hamid Al Shaeri') is None
+    assert replay.search_song('Never Recorded', 'Anyone') is None
+    assert len(stub.calls) == 2
+
+
+def test_refresh_overwrites_the_stored_entry(cache_path):
+    stub = StubGenius({'Vivir Mi Vida': 'old lyrics'})
+    CachedGenius(stub, cache_path=cache_path).search_song('Vivir Mi Vida', 'Marc Anthony')
+
+    stub.songs['Vivir Mi Vida'] = 'new lyrics'
+    refreshed = CachedGenius(stub, cache_path=cache_path, mode='refresh')
+    assert refreshed.search_song('Vivir Mi Vida', 'Marc Anthony').lyrics == 'new lyrics'
+
+    replay = CachedGenius(None, cache_path=cache_path, mode='replay')
+    assert replay.search_song('Vivir Mi Vida', 'Marc Anthony').lyrics == 'new lyrics'
+    assert len(stub.calls) == 2
+
+
+def test_client_options_are_part_of_the_key(cache_path):
+    stub = StubGenius({'Cántalo': 'cántalo'})
+    CachedGenius(stub, cache_path=cache_path, options={'remove_section_headers': True}).search_song('Cántalo', 'Ricky Martin')
+
+    other = CachedGenius(stub, cache_path=cache_path, options={'remove_section_headers': False})
+    other.search_song('Cántalo', 'Ricky Martin')
+    assert len(stub.calls) == 2
+
+
+def test_from_env_rejects_unknown_mode_before_token_check(cache_path, monkeypatch):
+    monkeypatch.setenv('GENIUS_CACHE_MODE', 'bogus')
+    monkeypatch.setenv('GENIUS_CACHE_PATH', cache_path)
+    monkeypatch.delenv('GENIUS_API_TOKEN', raising=False)
+
+    with pytest.raises(ValueError, match="Unknown Genius cache mode 'bogus'"):
+        CachedGenius.from_env()